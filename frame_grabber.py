@@ -0,0 +1,67 @@
+"""
+Frame Capture Module
+Reads camera frames on a background thread so capture overlaps detection.
+"""
+
+import queue
+import threading
+
+
+class FrameGrabber(threading.Thread):
+    """Continuously reads frames from a capture device into a one-slot
+    queue, dropping stale frames so consumers always get the newest one."""
+
+    def __init__(self, cap):
+        """
+        Initialize the FrameGrabber.
+
+        Args:
+            cap: An opened cv2.VideoCapture instance
+        """
+        super().__init__(daemon=True)
+        self.cap = cap
+        self.queue = queue.Queue(maxsize=1)
+        self.stop_event = threading.Event()
+
+    def run(self):
+        """Capture loop: read frames and keep only the newest one queued."""
+        while not self.stop_event.is_set():
+            success, img = self.cap.read()
+            if not success:
+                self.stop_event.set()
+                break
+            put_latest(self.queue, img)
+
+    def read(self, timeout=1.0):
+        """
+        Get the newest captured frame.
+
+        Args:
+            timeout: Seconds to wait for a frame
+
+        Returns:
+            img: The frame, or None if capture stopped or timed out
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        """Stop the capture loop."""
+        self.stop_event.set()
+
+
+def put_latest(q, item):
+    """Put item into a one-slot queue, evicting a stale entry if needed."""
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            pass
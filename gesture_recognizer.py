@@ -8,8 +8,24 @@ import math
 
 
 class GestureRecognizer:
-    """Recognizes sign language gestures based on hand landmark analysis."""
-    
+    """Recognizes sign language gestures based on hand landmark analysis.
+
+    Internally all landmark data is a contiguous (21, 2) float32 array
+    (row i = landmark i, columns x, y) - one cache-friendly block that
+    NumPy can vectorize over. Legacy list-of-rows input is converted at
+    the boundary by _as_xy.
+    """
+
+    # Landmark index arrays for the vectorized finger-state comparison
+    # (index, middle, ring, pinky tips and PIP joints)
+    FINGER_TIPS = np.array([8, 12, 16, 20])
+    FINGER_PIPS = np.array([6, 10, 14, 18])
+
+    # Endpoint indices for the batched distance computation:
+    # thumb-index, index-middle, wrist-middle (hand size)
+    DIST_PAIRS_A = np.array([4, 8, 0])
+    DIST_PAIRS_B = np.array([8, 12, 12])
+
     def __init__(self):
         """Initialize the gesture recognizer."""
         # Landmark indices for MediaPipe Hands
@@ -28,17 +44,72 @@ class GestureRecognizer:
             'RING_MCP': 13, 'RING_PIP': 14, 'RING_DIP': 15, 'RING_TIP': 16,
             'PINKY_MCP': 17, 'PINKY_PIP': 18, 'PINKY_DIP': 19, 'PINKY_TIP': 20
         }
+
+        # Last landmark array seen by analyze_fingers, reused within the
+        # same frame by recognize_gesture
+        self._last_arr = None
+
+        # Finger states from the most recent recognize_gesture call, for
+        # callers (e.g. the debug HUD) that want them without re-analyzing
+        self.last_fingers = None
+        self.last_extended_count = 0
+
+        # Gesture dispatch table keyed by the 5-bit finger mask
+        # (thumb<<4 | index<<3 | middle<<2 | ring<<1 | pinky). Entries are
+        # tried in the original rule order; a None check accepts outright.
+        self._gesture_table = {
+            0b10000: ((8, "Good", 0.9, self._check_thumb_up),
+                      (9, "Bad", 0.85, self._check_thumb_down),
+                      (21, "A", 0.8, self._check_thumb_on_side)),
+            0b00000: ((9, "Bad", 0.85, self._check_thumb_down),
+                      (10, "Stop", 0.9, None)),
+            0b11000: ((3, "Yes", 0.9, self._check_ok_circle),
+                      (23, "C", 0.75, self._check_c_shape)),
+            0b01100: ((20, "Victory", 0.85, self._check_v_spread),),
+            0b01000: ((12, "More", 0.8, None),),
+            0b11111: ((0, "Hello", 0.9, None),),
+            0b01110: ((13, "Less", 0.8, None),),
+            0b01111: ((14, "Water", 0.75, None),),
+            0b11001: ((7, "I Love You", 0.85, None),),
+        }
     
+    @staticmethod
+    def _as_xy(landmarks):
+        """
+        Normalize landmark input to a (21, 2) float32 array of x, y.
+
+        Accepts the detector's (21, 2) pixel-coordinate array directly, and
+        converts legacy [id, x, y] / [id, x, y, z] row lists by dropping the
+        id (and z) columns. Returns None for anything malformed.
+        """
+        if landmarks is None:
+            return None
+        arr = np.asarray(landmarks, dtype=np.float32)
+        if arr.ndim != 2 or arr.shape[0] < 21:
+            return None
+        if arr.shape[1] > 2:
+            # Dropping the id (and z) columns leaves a strided view; make
+            # it contiguous so downstream NumPy ops stay on the fast path
+            arr = np.ascontiguousarray(arr[:, 1:3])
+        return arr
+
+    @staticmethod
+    def _sqdist(point1, point2):
+        """Squared Euclidean distance between two points."""
+        dx = point1[0] - point2[0]
+        dy = point1[1] - point2[1]
+        return dx * dx + dy * dy
+
     def calculate_distance(self, point1, point2):
         """Calculate Euclidean distance between two points."""
-        return math.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
-    
+        return math.sqrt(self._sqdist(point1, point2))
+
     def is_finger_extended(self, landmarks, finger_tip, finger_pip, finger_mcp, is_thumb=False):
         """
         Check if a finger is extended.
-        
+
         Args:
-            landmarks: List of landmark positions [id, x, y, z]
+            landmarks: (21, 2) array of landmark x, y coordinates
             finger_tip: Tip landmark index
             finger_pip: PIP joint landmark index
             finger_mcp: MCP joint landmark index
@@ -46,51 +117,48 @@ class GestureRecognizer:
         """
         if len(landmarks) <= max(finger_tip, finger_pip, finger_mcp):
             return False
-        
-        tip = landmarks[finger_tip]  # [id, x, y, z]
+
+        tip = landmarks[finger_tip]  # [x, y]
         pip = landmarks[finger_pip]
         mcp = landmarks[finger_mcp]
         wrist = landmarks[0]
-        
+
         if is_thumb:
             # For thumb, check if tip is further from wrist than MCP joint
             # Thumb extended if tip is more to the side than MCP
-            tip_dist_from_wrist_x = abs(tip[1] - wrist[1])
-            mcp_dist_from_wrist_x = abs(mcp[1] - wrist[1])
+            tip_dist_from_wrist_x = abs(tip[0] - wrist[0])
+            mcp_dist_from_wrist_x = abs(mcp[0] - wrist[0])
             return tip_dist_from_wrist_x > mcp_dist_from_wrist_x
         else:
             # For other fingers, check if tip is above PIP joint (smaller y = higher on screen)
-            # In image coordinates, y increases downward, so tip[2] < pip[2] means tip is above pip
-            return tip[2] < pip[2]
-    
+            # In image coordinates, y increases downward, so tip y < pip y means tip is above pip
+            return tip[1] < pip[1]
+
     def analyze_fingers(self, landmarks):
         """
         Analyze which fingers are extended.
-        
+
         Returns:
             dict: Finger states (True = extended, False = closed)
         """
-        if len(landmarks) < 21:
+        arr = self._as_xy(landmarks)
+        if arr is None:
             return None
-        
+        self._last_arr = arr
+
+        # One vectorized comparison covers the four non-thumb fingers
+        # (tip above PIP joint); the thumb keeps its sideways-distance test
+        extended = arr[self.FINGER_TIPS, 1] < arr[self.FINGER_PIPS, 1]
+        thumb = abs(arr[4, 0] - arr[0, 0]) > abs(arr[2, 0] - arr[0, 0])
+
         fingers = {
-            'thumb': self.is_finger_extended(
-                landmarks, 4, 3, 2, is_thumb=True
-            ),
-            'index': self.is_finger_extended(
-                landmarks, 8, 6, 5, is_thumb=False
-            ),
-            'middle': self.is_finger_extended(
-                landmarks, 12, 10, 9, is_thumb=False
-            ),
-            'ring': self.is_finger_extended(
-                landmarks, 16, 14, 13, is_thumb=False
-            ),
-            'pinky': self.is_finger_extended(
-                landmarks, 20, 18, 17, is_thumb=False
-            )
+            'thumb': bool(thumb),
+            'index': bool(extended[0]),
+            'middle': bool(extended[1]),
+            'ring': bool(extended[2]),
+            'pinky': bool(extended[3])
         }
-        
+
         return fingers
     
     def count_extended_fingers(self, fingers):
@@ -98,169 +166,126 @@ class GestureRecognizer:
         if fingers is None:
             return 0
         return sum([1 for f in fingers.values() if f])
-    
+
+    def set_landmarks(self, landmarks):
+        """
+        Convert and cache the current frame's landmarks.
+
+        Returns the cached (21, 2) float32 array (or None), which
+        analyze_fingers_cached and recognize_gesture reuse so the frame's
+        landmarks are converted exactly once.
+        """
+        self._last_arr = self._as_xy(landmarks)
+        return self._last_arr
+
+    def analyze_fingers_cached(self):
+        """Analyze finger states using the landmarks cached by the last
+        set_landmarks/recognize_gesture call, without reconverting them."""
+        if self._last_arr is None:
+            return None
+        return self.analyze_fingers(self._last_arr)
+
+    @staticmethod
+    def finger_mask(fingers):
+        """Pack the finger-state dict into a 5-bit integer mask."""
+        return (fingers['thumb'] << 4 | fingers['index'] << 3 |
+                fingers['middle'] << 2 | fingers['ring'] << 1 | fingers['pinky'])
+
+    # Confirmation checks for gestures that share a finger mask. Each takes
+    # the (21, 2) landmark array plus the squared normalized thumb-index and
+    # index-middle distances and returns whether the candidate sign holds.
+    # Thresholds are squared so no sqrt is ever taken.
+
+    def _check_thumb_up(self, arr, thumb_index_sq, index_middle_sq):
+        # Thumb tip above wrist
+        return arr[4, 1] < arr[0, 1]
+
+    def _check_thumb_down(self, arr, thumb_index_sq, index_middle_sq):
+        # Thumb tip significantly below wrist
+        return arr[4, 1] > arr[0, 1] + 30
+
+    def _check_thumb_on_side(self, arr, thumb_index_sq, index_middle_sq):
+        # Thumb close to wrist horizontally (letter A fist)
+        return abs(arr[4, 0] - arr[0, 0]) < 30
+
+    def _check_ok_circle(self, arr, thumb_index_sq, index_middle_sq):
+        # Thumb and index close together (circle), other fingers curled
+        if thumb_index_sq >= 0.04:  # 0.2 ** 2
+            return False
+        return (arr[12, 1] > arr[10, 1] and
+                arr[16, 1] > arr[14, 1] and
+                arr[20, 1] > arr[18, 1])
+
+    def _check_c_shape(self, arr, thumb_index_sq, index_middle_sq):
+        # Moderate thumb-index distance (C shape)
+        return 0.04 < thumb_index_sq < 0.16  # (0.2 ** 2, 0.4 ** 2)
+
+    def _check_v_spread(self, arr, thumb_index_sq, index_middle_sq):
+        # Index and middle fingers spread apart
+        return index_middle_sq > 0.04  # 0.2 ** 2
+
     def recognize_gesture(self, landmarks):
         """
         Recognize gesture from hand landmarks.
         
         Args:
-            landmarks: List of landmark positions [id, x, y, z]
-            
+            landmarks: (21, 2) array of landmark x, y coordinates (legacy
+                       [id, x, y(, z)] lists are converted)
+
         Returns:
             tuple: (sign_id, sign_name, confidence)
         """
-        if landmarks is None or len(landmarks) < 21:
+        landmarks = self.set_landmarks(landmarks)
+        if landmarks is None:
             return None, None, 0.0
-        
-        # Convert to list of [x, y] coordinates
-        hand_landmarks = [[lm[1], lm[2]] for lm in landmarks]
-        
+
         # Analyze finger states
         fingers = self.analyze_fingers(landmarks)
         if fingers is None:
             return None, None, 0.0
-        
-        extended_count = self.count_extended_fingers(fingers)
-        
-        # Get key landmark positions
-        thumb_tip = landmarks[4]
-        index_tip = landmarks[8]
-        middle_tip = landmarks[12]
-        ring_tip = landmarks[16]
-        pinky_tip = landmarks[20]
-        wrist = landmarks[0]
-        
-        # Calculate distances
-        thumb_index_dist = self.calculate_distance(
-            [thumb_tip[1], thumb_tip[2]], [index_tip[1], index_tip[2]]
-        )
-        index_middle_dist = self.calculate_distance(
-            [index_tip[1], index_tip[2]], [middle_tip[1], middle_tip[2]]
-        )
-        
+
+        # The 5-bit mask both drives dispatch and yields the extended
+        # count as its popcount, so the finger dict is walked only once
+        mask = self.finger_mask(fingers)
+        self.last_fingers = fingers
+        self.last_extended_count = bin(mask).count("1")
+
+        # Calculate all three squared distances in one vectorized pass
+        # (thresholds are squared too, so no sqrt is ever taken)
+        diff = landmarks[self.DIST_PAIRS_A] - landmarks[self.DIST_PAIRS_B]
+        thumb_index_sq, index_middle_sq, hand_size_sq = (diff * diff).sum(axis=1)
+
         # Normalize distances (relative to hand size)
-        hand_size = self.calculate_distance(
-            [wrist[1], wrist[2]], [middle_tip[1], middle_tip[2]]
-        )
-        if hand_size < 10:  # Too small, invalid
+        if hand_size_sq < 100:  # Hand smaller than 10 px, invalid
             return None, None, 0.0
-        
-        thumb_index_norm = thumb_index_dist / hand_size
-        index_middle_norm = index_middle_dist / hand_size
-        
-        # Gesture Recognition Logic
-        
-        # THUMBS UP (Good) - Only thumb extended, others closed
-        if fingers['thumb'] and not fingers['index'] and not fingers['middle'] and \
-           not fingers['ring'] and not fingers['pinky']:
-            # Verify thumb is actually pointing up (tip above wrist)
-            if thumb_tip[2] < wrist[2]:  # Thumb tip above wrist
-                return 8, "Good", 0.9
-        
-        # THUMBS DOWN (Bad) - Thumb pointing down, others closed
-        if not fingers['index'] and not fingers['middle'] and \
-           not fingers['ring'] and not fingers['pinky']:
-            # Check if thumb is pointing down (tip below wrist)
-            if thumb_tip[2] > wrist[2] + 30:  # Thumb tip significantly below wrist
-                return 9, "Bad", 0.85
-        
-        # OK SIGN / YES - Thumb and index form circle, others closed
-        if fingers['thumb'] and fingers['index'] and not fingers['middle'] and \
-           not fingers['ring'] and not fingers['pinky']:
-            # Check if thumb and index are close (forming a circle)
-            if thumb_index_norm < 0.2:  # Thumb and index close together (circle)
-                # Also check if middle, ring, pinky are closed (not extended)
-                middle_tip = landmarks[12]
-                ring_tip = landmarks[16]
-                pinky_tip = landmarks[20]
-                middle_pip = landmarks[10]
-                ring_pip = landmarks[14]
-                pinky_pip = landmarks[18]
-                
-                if (middle_tip[2] > middle_pip[2] and 
-                    ring_tip[2] > ring_pip[2] and 
-                    pinky_tip[2] > pinky_pip[2]):
-                    return 3, "Yes", 0.9
-        
-        # PEACE SIGN (V) - Index and middle extended, others closed
-        if not fingers['thumb'] and fingers['index'] and fingers['middle'] and \
-           not fingers['ring'] and not fingers['pinky']:
-            if index_middle_norm > 0.2:  # Fingers spread apart
-                return 20, "Victory", 0.85
-        
-        # POINTING (Index extended) - Only index finger extended
-        if not fingers['thumb'] and fingers['index'] and not fingers['middle'] and \
-           not fingers['ring'] and not fingers['pinky']:
-            return 12, "More", 0.8
-        
-        # FIST (Stop) - All fingers closed
-        if not fingers['thumb'] and not fingers['index'] and not fingers['middle'] and \
-           not fingers['ring'] and not fingers['pinky']:
-            return 10, "Stop", 0.9
-        
-        # OPEN HAND (Hello) - All fingers extended
-        if fingers['thumb'] and fingers['index'] and fingers['middle'] and \
-           fingers['ring'] and fingers['pinky']:
-            return 0, "Hello", 0.9
-        
-        # THREE FINGERS - Index, middle, ring extended
-        if not fingers['thumb'] and fingers['index'] and fingers['middle'] and \
-           fingers['ring'] and not fingers['pinky']:
-            return 13, "Less", 0.8
-        
-        # FOUR FINGERS - All except thumb
-        if not fingers['thumb'] and fingers['index'] and fingers['middle'] and \
-           fingers['ring'] and fingers['pinky']:
-            return 14, "Water", 0.75
-        
-        # I LOVE YOU - Thumb, index, pinky extended
-        if fingers['thumb'] and fingers['index'] and not fingers['middle'] and \
-           not fingers['ring'] and fingers['pinky']:
-            return 7, "I Love You", 0.85
-        
-        # LETTER A - Fist with thumb on side
-        if not fingers['index'] and not fingers['middle'] and not fingers['ring'] and \
-           not fingers['pinky'] and fingers['thumb']:
-            # Check if thumb is positioned on the side
-            if abs(thumb_tip[1] - wrist[1]) < 30:  # Thumb close to wrist horizontally
-                return 21, "A", 0.8
-        
-        # LETTER B - All fingers extended except thumb
-        if not fingers['thumb'] and fingers['index'] and fingers['middle'] and \
-           fingers['ring'] and fingers['pinky']:
-            # Check if fingers are together
-            if index_middle_norm < 0.3:
-                return 22, "B", 0.8
-        
-        # LETTER C - Curved hand (thumb and index form C)
-        if fingers['thumb'] and fingers['index'] and not fingers['middle'] and \
-           not fingers['ring'] and not fingers['pinky']:
-            if 0.2 < thumb_index_norm < 0.4:  # Moderate distance (C shape)
-                return 23, "C", 0.75
-        
+
+        thumb_index_norm_sq = thumb_index_sq / hand_size_sq
+        index_middle_norm_sq = index_middle_sq / hand_size_sq
+
+        # Dispatch on the finger mask: one hash lookup replaces the chain
+        # of per-gesture finger-state comparisons, then each candidate for
+        # that mask runs its confirmation check in the original rule order
+        for sign_id, sign_name, confidence, check in self._gesture_table.get(mask, ()):
+            if check is None or check(landmarks, thumb_index_norm_sq, index_middle_norm_sq):
+                return sign_id, sign_name, confidence
+
         # No match found
         return None, None, 0.0
     
     def recognize_from_landmarks(self, landmark_list):
         """
-        Recognize sign from landmark list format [id, x, y].
-        
+        Recognize sign from detector landmarks.
+
         Args:
-            landmark_list: List of landmarks in format [id, x, y]
-            
+            landmark_list: (21, 2) array of x, y coordinates, or a legacy
+                           list of [id, x, y] rows
+
         Returns:
             tuple: (sign_id, sign_name, confidence)
         """
-        if landmark_list is None or len(landmark_list) < 21:
+        landmarks = self._as_xy(landmark_list)
+        if landmarks is None:
             return None, None, 0.0
-        
-        # Convert to format expected by recognize_gesture
-        landmarks = []
-        for lm in landmark_list:
-            if len(lm) >= 3:
-                landmarks.append([lm[0], lm[1], lm[2], 0])  # [id, x, y, z]
-            else:
-                return None, None, 0.0
-        
+
         return self.recognize_gesture(landmarks)
 
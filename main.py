@@ -5,9 +5,14 @@ Real-time sign language detection and text conversion.
 
 import cv2
 import numpy as np
+import queue
+import threading
 import time
 import os
+from collections import OrderedDict
 from detector import HandDetector
+from frame_grabber import FrameGrabber, put_latest
+from overlay import blit_overlay, render_text_overlay, wrap_text_pixels
 from recognizer import SignRecognizer
 from text_converter import TextConverter
 from text_to_speech import TextToSpeech
@@ -15,6 +20,70 @@ from text_to_speech import TextToSpeech
 
 
 
+# Squared-pixel landmark movement (summed over all 21 landmarks) below
+# which the previous frame's recognition result is reused
+MOTION_EPS = 40.0
+
+# Shared HUD drawing constants, resolved once at import instead of
+# rebuilding the tuples (and re-fetching cv2 attributes) per frame
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+GREEN = (0, 255, 0)
+RED = (0, 0, 255)
+WHITE = (255, 255, 255)
+GREY = (200, 200, 200)
+MAGENTA = (255, 0, 255)
+
+
+class DetectionState:
+    """Sign-hold tracking state for the main loop.
+
+    Slotted attribute access is cheaper than dict lookups on the per-frame
+    path, and typos in field names fail loudly instead of creating keys.
+    """
+
+    __slots__ = ('current_sign', 'sign_start_time', 'last_sign_time', 'last_spoken_sign')
+
+    def __init__(self):
+        self.current_sign = None
+        self.sign_start_time = None
+        self.last_sign_time = 0.0
+        self.last_spoken_sign = None
+
+
+def _detection_worker(grabber, detector, out_queue, stop_event):
+    """Detection-thread loop: newest frame in, detection results out.
+
+    Runs the flip and the MediaPipe inference off the UI thread, pushing
+    (img, landmarks, features, hand_type) into a one-slot queue with stale
+    results dropped. Landmarks and features are copied out of the
+    detector's reused buffers before crossing the thread boundary.
+    """
+    while not stop_event.is_set():
+        img = grabber.read(timeout=0.5)
+        if img is None:
+            if grabber.stop_event.is_set():
+                stop_event.set()
+            continue
+
+        # Flip into a fresh buffer (not the detector's shared one) so the
+        # frame can be handed to the render thread without aliasing
+        img = cv2.flip(img, 1)
+        img, _ = detector.find_hands(img, draw=True)
+
+        landmarks = detector.get_landmark_positions(img, hand_no=0)
+        features = detector.extract_features(img, hand_no=0)
+        hand_type = detector.get_hand_type(hand_no=0)
+        detection_score = detector.get_detection_score(hand_no=0)
+
+        put_latest(out_queue, (
+            img,
+            None if landmarks is None else landmarks.copy(),
+            None if features is None else features.copy(),
+            hand_type,
+            detection_score,
+        ))
+
+
 def main():
     """Main application loop."""
     # Initialize components
@@ -22,7 +91,9 @@ def main():
         mode=False,
         max_hands=1,
         detection_confidence=0.7,
-        tracking_confidence=0.5
+        tracking_confidence=0.5,
+        process_width=640,  # Run MediaPipe on a downscaled copy of the 720p frame
+        model_complexity=0  # Light landmark model; plenty for coarse gestures
     )
     
     # Use gesture-based recognition (rule-based, no training needed)
@@ -62,18 +133,60 @@ def main():
     if not tts.enabled:
         tts_enabled = False  # Update flag if TTS failed to initialize
     
-    # Initialize camera
+    # Initialize camera. MJPG keeps the USB transfer compressed (the raw
+    # YUYV default saturates USB2 at 720p) and OpenCV decodes it through
+    # libjpeg-turbo's SIMD path; a 1-frame driver buffer keeps latency down.
     cap = cv2.VideoCapture(0)
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+    cap.set(cv2.CAP_PROP_FPS, 30)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
     
     # Variables for sign recognition
-    last_sign_time = 0
+    state = DetectionState()
     sign_hold_duration = 1.0  # seconds to hold sign before adding to sentence
-    current_sign = None
-    sign_start_time = None
     confidence_threshold = 0.4
-    last_spoken_sign = None  # Track last spoken sign to avoid repetition
+    frame_idx = 0  # Frame counter for the every-other-frame HUD refresh
+
+    # Cached HUD strings, re-formatted only when the underlying value changes
+    hud_sign_line = None
+    hud_sign_key = None
+    hud_finger_line = None
+    hud_finger_count = None
+    hud_hand_line = None
+    hud_hand_type = None
+    prev_landmarks = None  # Landmarks of the last frame that was recognized
+    prev_result = (None, 0.0)
+    sentence = ""  # Refreshed only when the sentence mutates, not per frame
+    # Wrapped-and-rendered sentence overlays keyed by (sentence, frame
+    # width): re-displaying any previously seen sentence (e.g. after a
+    # backspace) is a dict hit instead of a re-wrap and re-render. Bounded
+    # LRU (each entry holds a full-width strip) and also cleared on 'c'.
+    wrap_cache = OrderedDict()
+    wrap_cache_size = 32
+
+    # Pre-rendered HUD overlays: the TTS badge has two fixed states and the
+    # sentence strip is rebuilt only when the sentence changes
+    tts_badges = {
+        True: render_text_overlay(["TTS: ON"], 130, font_scale=0.6, color=GREEN),
+        False: render_text_overlay(["TTS: OFF"], 130, font_scale=0.6, color=RED),
+    }
+
+    # Instruction panel is static apart from the TTS state, so both
+    # variants are rasterized once up front
+    instruction_overlays = {
+        on: render_text_overlay(
+            [
+                "Press 'q' to quit",
+                "Press 'c' to clear",
+                "Press 'b' for backspace",
+                f"Press 't' to toggle TTS ({'ON' if on else 'OFF'})",
+            ],
+            360, line_height=20, font_scale=0.5, color=GREY, thickness=1
+        )
+        for on in (True, False)
+    }
     
     print("Sign Language Detector Started")
     print("Controls:")
@@ -88,133 +201,148 @@ def main():
         print("  - Text-to-Speech: DISABLED")
         print("  - Install pyttsx3 to enable: pip install pyttsx3")
     
+    # Pipeline threads: the grabber owns camera I/O and the detection
+    # worker owns MediaPipe, so capture, inference, and rendering overlap
+    # instead of running back-to-back on one thread
+    grabber = FrameGrabber(cap)
+    grabber.start()
+    detection_queue = queue.Queue(maxsize=1)
+    stop_event = threading.Event()
+    detection_thread = threading.Thread(
+        target=_detection_worker,
+        args=(grabber, detector, detection_queue, stop_event),
+        daemon=True
+    )
+    detection_thread.start()
+
     while True:
-        success, img = cap.read()
-        if not success:
-            print("Failed to read from camera")
-            break
-        
-        # Flip image horizontally for mirror effect
-        img = cv2.flip(img, 1)
-        
-        # Detect hands
-        img, results = detector.find_hands(img, draw=True)
-        
-        # Get hand landmarks and features
-        landmarks = detector.get_landmark_positions(img, hand_no=0)
-        features = detector.extract_features(img, hand_no=0)
-        
-        if landmarks and len(landmarks) >= 21:
-            # Recognize sign using gesture recognition (landmarks-based)
-            sign_text, confidence = recognizer.recognize_sign(
-                features, 
-                confidence_threshold=confidence_threshold,
-                landmarks=landmarks
-            )
-            
+        try:
+            img, landmarks, features, hand_type, detection_score = detection_queue.get(timeout=0.5)
+        except queue.Empty:
+            if stop_event.is_set():
+                print("Failed to read from camera")
+                break
+            continue
+
+        sign_visible = False
+        if landmarks is not None and len(landmarks) >= 21:
+            # Reuse the previous result when the hand has barely moved;
+            # during the ~1s sign hold this skips most recognition passes
+            if (prev_landmarks is not None
+                    and float(np.sum((landmarks - prev_landmarks) ** 2)) < MOTION_EPS):
+                sign_text, confidence = prev_result
+            else:
+                # Recognize sign using gesture recognition (landmarks-based)
+                sign_text, confidence = recognizer.recognize_sign(
+                    features,
+                    confidence_threshold=confidence_threshold,
+                    landmarks=landmarks,
+                    detection_score=detection_score
+                )
+                prev_landmarks = landmarks
+                prev_result = (sign_text, confidence)
+
             current_time = time.time()
             
             if sign_text:
                 # Check if this is the same sign as before
-                if sign_text == current_sign:
+                if sign_text == state.current_sign:
                     # Check if we've held the sign long enough
-                    if sign_start_time and (current_time - sign_start_time) >= sign_hold_duration:
+                    if state.sign_start_time and (current_time - state.sign_start_time) >= sign_hold_duration:
                         # Add sign to sentence
                         if converter.add_sign(sign_text, min_confidence=confidence_threshold, confidence=confidence):
+                            sentence = converter.get_current_sentence()
                             # Speak the recognized sign
-                            if tts_enabled and tts and tts.engine is not None and sign_text != last_spoken_sign:
+                            if tts_enabled and tts and tts.engine is not None and sign_text != state.last_spoken_sign:
                                 tts.speak_async(sign_text)
-                                last_spoken_sign = sign_text
+                                state.last_spoken_sign = sign_text
                                 print(f"Speaking: {sign_text}")
-                        sign_start_time = None  # Reset to avoid重复添加
-                        current_sign = None
+                        state.sign_start_time = None  # Reset to avoid重复添加
+                        state.current_sign = None
                 else:
                     # New sign detected
-                    current_sign = sign_text
-                    sign_start_time = current_time
+                    state.current_sign = sign_text
+                    state.sign_start_time = current_time
                 
-                last_sign_time = current_time
+                state.last_sign_time = current_time
                 
-                # Display current sign
-                cv2.putText(
-                    img, f"Sign: {sign_text} ({confidence:.2f})",
-                    (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2
-                )
+                # Re-format the sign line only when it changes; the draw
+                # itself happens in the render block below the frame gate
+                sign_key = (sign_text, round(confidence, 2))
+                if sign_key != hud_sign_key:
+                    hud_sign_key = sign_key
+                    hud_sign_line = f"Sign: {sign_text} ({confidence:.2f})"
+                sign_visible = True
             else:
                 # No sign detected or low confidence
-                if current_time - last_sign_time > 0.5:
-                    current_sign = None
-                    sign_start_time = None
-        
-        # Display current sentence
-        sentence = converter.get_current_sentence()
-        if sentence:
-            # Wrap text if too long
-            words = sentence.split()
-            lines = []
-            current_line = ""
-            for word in words:
-                test_line = current_line + " " + word if current_line else word
-                if len(test_line) < 40:
-                    current_line = test_line
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word
-            if current_line:
-                lines.append(current_line)
-            
-            y_offset = 70
-            for line in lines:
-                cv2.putText(
-                    img, line,
-                    (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2
-                )
-                y_offset += 30
+                if current_time - state.last_sign_time > 0.5:
+                    state.current_sign = None
+                    state.sign_start_time = None
         
-        # Display instructions
-        instructions = [
-            "Press 'q' to quit",
-            "Press 'c' to clear",
-            "Press 'b' for backspace",
-            f"Press 't' to toggle TTS ({'ON' if tts_enabled else 'OFF'})"
-        ]
-        y_pos = img.shape[0] - 110
-        for instruction in instructions:
+        # Render the HUD and poll the keyboard only every other frame;
+        # recognition above still runs per frame. Amortizes the putText,
+        # imshow, and waitKey event-pump cost, and the 1s hold-to-commit
+        # tolerates the halved key-poll rate.
+        frame_idx += 1
+        if frame_idx % 2:
+            continue
+
+        # Display current sign
+        if sign_visible:
             cv2.putText(
-                img, instruction,
-                (10, y_pos), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1
+                img, hud_sign_line,
+                (10, 30), FONT, 1, GREEN, 2
             )
-            y_pos += 20
+
+        # Display current sentence: wrap and render at most once per
+        # (sentence, width) pair, then reuse the cached overlay
+        wrap_key = (sentence, img.shape[1])
+        try:
+            sentence_overlay = wrap_cache[wrap_key]
+            wrap_cache.move_to_end(wrap_key)
+        except KeyError:
+            wrapped_lines = wrap_text_pixels(sentence, img.shape[1] - 20)
+            if wrapped_lines:
+                sentence_overlay = render_text_overlay(wrapped_lines, img.shape[1] - 10)
+            else:
+                sentence_overlay = None
+            wrap_cache[wrap_key] = sentence_overlay
+            if len(wrap_cache) > wrap_cache_size:
+                wrap_cache.popitem(last=False)
+
+        if sentence_overlay is not None:
+            blit_overlay(img, sentence_overlay[0], sentence_overlay[1], 10, 48)
+        
+        # Display instructions (pre-rendered panel, one per TTS state)
+        panel, panel_mask = instruction_overlays[tts_enabled]
+        blit_overlay(img, panel, panel_mask, 10, img.shape[0] - 122)
         
-        # Display TTS status
+        # Display TTS status (pre-rendered badge, one per state)
         if tts and tts.engine is not None:
-            tts_status = "TTS: ON" if tts_enabled else "TTS: OFF"
-            tts_color = (0, 255, 0) if tts_enabled else (0, 0, 255)
-            cv2.putText(
-                img, tts_status,
-                (img.shape[1] - 120, img.shape[0] - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, tts_color, 2
-            )
+            badge, badge_mask = tts_badges[tts_enabled]
+            blit_overlay(img, badge, badge_mask, img.shape[1] - 130, img.shape[0] - 52)
         
         # Display hand type and finger states if detected
-        hand_type = detector.get_hand_type(hand_no=0)
-        if hand_type and landmarks and len(landmarks) >= 21:
+        if hand_type and landmarks is not None and len(landmarks) >= 21:
             # Show finger states for debugging
             if hasattr(recognizer, 'gesture_recognizer') and recognizer.gesture_recognizer:
-                fingers = recognizer.gesture_recognizer.analyze_fingers(
-                    [[lm[0], lm[1], lm[2], 0] for lm in landmarks]
-                )
-                if fingers:
-                    extended_count = recognizer.gesture_recognizer.count_extended_fingers(fingers)
-                    finger_info = f"Fingers: {extended_count}/5"
+                # Finger states were already computed inside recognize_sign
+                if recognizer.gesture_recognizer.last_fingers:
+                    extended_count = recognizer.gesture_recognizer.last_extended_count
+                    if extended_count != hud_finger_count:
+                        hud_finger_count = extended_count
+                        hud_finger_line = f"Fingers: {extended_count}/5"
                     cv2.putText(
-                        img, finger_info,
-                        (img.shape[1] - 200, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1
+                        img, hud_finger_line,
+                        (img.shape[1] - 200, 60), FONT, 0.5, GREY, 1
                     )
-            
+
+            if hand_type != hud_hand_type:
+                hud_hand_type = hand_type
+                hud_hand_line = f"Hand: {hand_type}"
             cv2.putText(
-                img, f"Hand: {hand_type}",
-                (img.shape[1] - 150, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 255), 2
+                img, hud_hand_line,
+                (img.shape[1] - 150, 30), FONT, 0.6, MAGENTA, 2
             )
         
         # Show image
@@ -226,11 +354,14 @@ def main():
             break
         elif key == ord('c'):
             converter.clear_sentence()
-            last_spoken_sign = None  # Reset spoken sign tracking
+            sentence = ""
+            wrap_cache.clear()
+            state.last_spoken_sign = None  # Reset spoken sign tracking
             print("Sentence cleared")
         elif key == ord('b'):
             converter.remove_last_word()
-            last_spoken_sign = None  # Reset spoken sign tracking
+            sentence = converter.get_current_sentence()
+            state.last_spoken_sign = None  # Reset spoken sign tracking
             print("Last word removed")
         elif key == ord('t'):
             # Toggle TTS
@@ -252,6 +383,10 @@ def main():
                     print("Text-to-Speech DISABLED")
     
     # Cleanup
+    stop_event.set()
+    grabber.stop()
+    detection_thread.join(timeout=1.0)
+    grabber.join(timeout=1.0)
     if tts:
         tts.shutdown()
     cap.release()
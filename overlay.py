@@ -0,0 +1,74 @@
+"""
+HUD Overlay Module
+Pre-renders text into reusable strips so frames avoid per-frame putText.
+"""
+
+import cv2
+import numpy as np
+from functools import lru_cache
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def render_text_overlay(lines, width, line_height=30, font_scale=0.7,
+                        color=(255, 255, 255), thickness=2):
+    """
+    Pre-render text lines into a strip image plus a nonzero-pixel mask.
+
+    The strip can be blitted onto a frame with boolean indexing, which is
+    much cheaper than re-rasterizing the glyphs with cv2.putText per frame.
+    """
+    height = max(line_height * len(lines), 1)
+    strip = np.zeros((height, width, 3), dtype=np.uint8)
+    y = line_height - 8
+    for line in lines:
+        cv2.putText(
+            strip, line,
+            (0, y), FONT, font_scale, color, thickness
+        )
+        y += line_height
+    return strip, strip.any(axis=2)
+
+
+@lru_cache(maxsize=256)
+def text_width(text, font_scale=0.7, thickness=2):
+    """Measured pixel width of text in FONT_HERSHEY_SIMPLEX, memoized so
+    each unique string is measured once."""
+    (width, _), _ = cv2.getTextSize(text, FONT, font_scale, thickness)
+    return width
+
+
+def wrap_text_pixels(text, max_width, font_scale=0.7, thickness=2):
+    """
+    Wrap text into lines whose measured pixel width fits max_width.
+
+    Unlike a character-count heuristic, this wraps on actual glyph widths;
+    word widths come from the memoized text_width, so re-wrapping after a
+    sentence change only measures words not seen before.
+    """
+    space_width = text_width(" ", font_scale, thickness)
+    lines = []
+    current = []
+    width = 0
+    for word in text.split():
+        word_width = text_width(word, font_scale, thickness)
+        if current and width + space_width + word_width > max_width:
+            lines.append(" ".join(current))
+            current = [word]
+            width = word_width
+        else:
+            width = width + space_width + word_width if current else word_width
+            current.append(word)
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+def blit_overlay(img, strip, mask, x, y):
+    """Copy the pre-rendered strip's text pixels onto the frame at (x, y)."""
+    h = min(strip.shape[0], img.shape[0] - y)
+    w = min(strip.shape[1], img.shape[1] - x)
+    if h <= 0 or w <= 0:
+        return
+    roi = img[y:y + h, x:x + w]
+    roi[mask[:h, :w]] = strip[:h, :w][mask[:h, :w]]
@@ -5,26 +5,39 @@ Classifies hand gestures into sign language signs.
 
 import numpy as np
 import cv2
+import hashlib
 import os
 import json
-from sklearn.ensemble import RandomForestClassifier
+from collections import OrderedDict
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
 from sklearn.model_selection import train_test_split
 import pickle
 from gesture_recognizer import GestureRecognizer
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class SignRecognizer:
-    def __init__(self, model_path=None, sign_dict_path="sign_dictionary.json", use_gesture_recognition=True):
+    def __init__(self, model_path=None, sign_dict_path="sign_dictionary.json", use_gesture_recognition=True,
+                 model_type="hist_gb"):
         """
         Initialize the SignRecognizer.
-        
+
         Args:
             model_path: Path to pre-trained model file
             sign_dict_path: Path to sign dictionary JSON file
             use_gesture_recognition: Use rule-based gesture recognition (default: True)
+            model_type: "hist_gb" for HistGradientBoostingClassifier
+                        (compact array-of-nodes trees, better cache
+                        behavior per prediction) or "random_forest" for
+                        the legacy RandomForestClassifier
         """
         self.model_path = model_path
         self.model = None
+        self.model_type = model_type
         self.sign_dict = self.load_sign_dictionary(sign_dict_path)
         self.use_gesture_recognition = use_gesture_recognition
         
@@ -34,34 +47,147 @@ class SignRecognizer:
         else:
             self.gesture_recognizer = None
         
+        # Pending feature rows for micro-batched prediction: queued frames
+        # are classified with a single predict_proba call on the stacked
+        # matrix, which amortizes the per-call overhead of walking every
+        # tree for one sample
+        self.max_batch_size = 8
+        self._pending_feats = []
+
+        # Optional ONNX Runtime session; set when model_path ends in
+        # .onnx, in which case predictions run through onnxruntime's
+        # compiled tree kernels instead of the pickled sklearn forest
+        self._onnx_session = None
+        self._onnx_input = None
+
+        # LRU cache for the gesture path, keyed by a hash of the pose
+        # quantized to 2-px bins: a steadily held sign maps to the same
+        # key frame after frame, so recognition becomes a dict hit
+        self._gesture_cache = OrderedDict()
+        self._gesture_cache_size = 128
+
+        # Reusable (21, 2) buffer for callers that still pass landmarks
+        # as Python lists, so conversion fills one array instead of
+        # allocating a fresh one per frame
+        self._lm_buf = np.empty((21, 2), dtype=np.float32)
+
+        # Last feature vector and prediction: consecutive frames of a held
+        # sign are nearly identical, so predict reuses the prior result
+        # when the features have barely moved
+        self._last_feat = None
+        self._last_pred = (None, 0.0)
+
+        # Rolling EMA of the detector's confidence; frames scoring well
+        # below the recent norm are noisy or occluded, so recognition is
+        # skipped for them entirely
+        self._ema_conf = 0.0
+
         if model_path and os.path.exists(model_path) and not use_gesture_recognition:
             self.load_model(model_path)
         elif not use_gesture_recognition:
             # Initialize a simple model (will need training)
-            self.model = RandomForestClassifier(n_estimators=100, random_state=42)
-    
+            self.model = self._build_model()
+
+    def _build_model(self):
+        """Construct an untrained classifier for the configured model_type."""
+        if self.model_type == "random_forest":
+            # Trees fit independently, so use every core for training and
+            # subsample rows per tree; train() drops back to one job for
+            # prediction, where batch=1 parallelism only adds overhead
+            return RandomForestClassifier(n_estimators=100, n_jobs=-1,
+                                          max_samples=0.8, random_state=42)
+        return HistGradientBoostingClassifier(max_iter=200, learning_rate=0.1, random_state=42)
+
     def load_sign_dictionary(self, dict_path):
         """Load sign dictionary from JSON file."""
         try:
-            with open(dict_path, 'r') as f:
-                return json.load(f)
+            if orjson is not None:
+                # orjson parses bytes several times faster than stdlib json
+                with open(dict_path, 'rb') as f:
+                    sign_dict = orjson.loads(f.read())
+            else:
+                with open(dict_path, 'r') as f:
+                    sign_dict = json.load(f)
         except FileNotFoundError:
             print(f"Warning: Sign dictionary not found at {dict_path}")
-            return {}
+            sign_dict = {}
+
+        # Parallel int-keyed view so per-frame lookups hash the sign id
+        # directly instead of allocating a str(sign_id) each time
+        self._sign_dict_int = {}
+        for key, value in sign_dict.items():
+            try:
+                self._sign_dict_int[int(key)] = value
+            except (TypeError, ValueError):
+                pass
+
+        return sign_dict
     
     def load_model(self, model_path):
-        """Load a trained model from file."""
+        """Load a trained model from file.
+
+        A .pkl path loads the pickled sklearn model; a .onnx path opens an
+        ONNX Runtime session instead, which evaluates the exported forest
+        with vectorized kernels (a clear win for the single-row queries
+        this app makes per frame).
+        """
+        if model_path.endswith('.onnx'):
+            try:
+                import onnxruntime
+                sess_options = onnxruntime.SessionOptions()
+                # Latency-bound single-row queries; threads only add overhead
+                sess_options.intra_op_num_threads = 1
+                self._onnx_session = onnxruntime.InferenceSession(
+                    model_path, sess_options, providers=['CPUExecutionProvider']
+                )
+                self._onnx_input = self._onnx_session.get_inputs()[0].name
+                print(f"ONNX model loaded from {model_path}")
+                return
+            except ImportError:
+                print("Warning: onnxruntime not installed. Install it with: pip install onnxruntime")
+            except Exception as e:
+                print(f"Error loading ONNX model: {e}")
+            self._onnx_session = None
+
         try:
             with open(model_path, 'rb') as f:
                 self.model = pickle.load(f)
             print(f"Model loaded from {model_path}")
         except Exception as e:
             print(f"Error loading model: {e}")
-            self.model = RandomForestClassifier(n_estimators=100, random_state=42)
-    
+            self.model = self._build_model()
+
     def save_model(self, model_path):
-        """Save the trained model to file."""
+        """Save the trained model to file.
+
+        A .pkl path pickles the sklearn model; a .onnx path exports it
+        with skl2onnx so load_model can later serve it via onnxruntime.
+        """
         os.makedirs(os.path.dirname(model_path) if os.path.dirname(model_path) else '.', exist_ok=True)
+
+        if model_path.endswith('.onnx'):
+            try:
+                from skl2onnx import convert_sklearn
+                from skl2onnx.common.data_types import FloatTensorType
+                n_features = self.model.n_features_in_
+                onnx_model = convert_sklearn(
+                    self.model,
+                    initial_types=[('input', FloatTensorType([None, n_features]))],
+                    # Plain probability tensor instead of a per-row dict output
+                    options={id(self.model): {'zipmap': False}}
+                )
+                with open(model_path, 'wb') as f:
+                    f.write(onnx_model.SerializeToString())
+                print(f"ONNX model saved to {model_path}")
+                return
+            except ImportError:
+                print("Warning: skl2onnx not installed. Install it with: pip install skl2onnx")
+                print("Saving pickled model instead.")
+                model_path = model_path[:-len('.onnx')] + '.pkl'
+            except Exception as e:
+                print(f"Error exporting ONNX model: {e}")
+                return
+
         with open(model_path, 'wb') as f:
             pickle.dump(self.model, f)
         print(f"Model saved to {model_path}")
@@ -84,82 +210,239 @@ class SignRecognizer:
         )
         
         self.model.fit(X_train, y_train)
-        
+
+        # Single-row queries at inference time are faster without the
+        # per-call joblib fan-out
+        if hasattr(self.model, 'n_jobs'):
+            self.model.n_jobs = 1
+
         train_score = self.model.score(X_train, y_train)
         test_score = self.model.score(X_test, y_test)
         
         print(f"Training accuracy: {train_score:.2f}")
         print(f"Test accuracy: {test_score:.2f}")
     
+    def _run_onnx(self, X):
+        """Run the ONNX session on a (n, n_features) float32 matrix.
+
+        Returns (labels, probabilities) arrays as produced by the exported
+        classifier (zipmap disabled, so probabilities is a dense matrix).
+        """
+        labels, probabilities = self._onnx_session.run(
+            None, {self._onnx_input: X.astype(np.float32, copy=False)}
+        )
+        return labels, probabilities
+
     def predict(self, features, confidence_threshold=0.3):
         """
         Predict sign from features.
-        
+
         Args:
             features: Feature vector (n_features,) or (1, n_features)
             confidence_threshold: Minimum confidence for prediction
-            
+
         Returns:
             prediction: Predicted sign ID or None
             confidence: Prediction confidence
         """
-        if self.model is None:
+        if self.model is None and self._onnx_session is None:
             return None, 0.0
-        
+
         if features is None or len(features) == 0:
             return None, 0.0
-        
+
         # Ensure features is 2D
         if len(features.shape) == 1:
             features = features.reshape(1, -1)
-        
+
+        # Near-identical features to the previous call (the common case
+        # while a sign is held) reuse the previous prediction outright
+        if (self._last_feat is not None
+                and self._last_feat.shape == features.shape
+                and np.max(np.abs(features - self._last_feat)) < 1e-3):
+            return self._last_pred
+
         # Get prediction probabilities
         try:
-            probabilities = self.model.predict_proba(features)[0]
-            max_prob_idx = np.argmax(probabilities)
-            confidence = probabilities[max_prob_idx]
-            
-            if confidence >= confidence_threshold:
-                prediction = self.model.classes_[max_prob_idx]
-                return int(prediction), float(confidence)
+            if self._onnx_session is not None:
+                labels, probabilities = self._run_onnx(features)
+                confidence = probabilities[0].max()
+                if confidence >= confidence_threshold:
+                    result = (int(labels[0]), float(confidence))
+                else:
+                    result = (None, float(confidence))
             else:
-                return None, float(confidence)
+                probabilities = self.model.predict_proba(features)[0]
+                max_prob_idx = np.argmax(probabilities)
+                confidence = probabilities[max_prob_idx]
+
+                if confidence >= confidence_threshold:
+                    prediction = self.model.classes_[max_prob_idx]
+                    result = (int(prediction), float(confidence))
+                else:
+                    result = (None, float(confidence))
+
+            self._last_feat = np.array(features, copy=True)
+            self._last_pred = result
+            return result
         except Exception as e:
             print(f"Error during prediction: {e}")
             return None, 0.0
     
-    def recognize_sign(self, features, confidence_threshold=0.3, landmarks=None):
+    def predict_batch(self, features_list, confidence_threshold=0.3):
+        """
+        Predict signs for several feature vectors with one model call.
+
+        One predict_proba on the stacked matrix amortizes the Python-to-C
+        boundary and traverses the forest with whole-batch rows, which is
+        far cheaper than calling predict once per frame.
+
+        Args:
+            features_list: Sequence of feature vectors (n_features,)
+            confidence_threshold: Minimum confidence for prediction
+
+        Returns:
+            results: List of (prediction, confidence) tuples, one per
+                     input row; prediction is None below the threshold
+        """
+        if (self.model is None and self._onnx_session is None) or not features_list:
+            return [(None, 0.0)] * len(features_list)
+
+        X = np.ascontiguousarray(np.vstack(features_list), dtype=np.float32)
+
+        try:
+            if self._onnx_session is not None:
+                predictions, probabilities = self._run_onnx(X)
+                confidences = probabilities.max(axis=1)
+            else:
+                probabilities = self.model.predict_proba(X)
+                best_idx = np.argmax(probabilities, axis=1)
+                confidences = probabilities[np.arange(len(best_idx)), best_idx]
+                predictions = self.model.classes_[best_idx]
+        except Exception as e:
+            print(f"Error during batch prediction: {e}")
+            return [(None, 0.0)] * len(features_list)
+
+        return [
+            (int(pred), float(conf)) if conf >= confidence_threshold else (None, float(conf))
+            for pred, conf in zip(predictions, confidences)
+        ]
+
+    def queue_features(self, features):
+        """
+        Queue a feature vector for batched prediction.
+
+        Returns:
+            bool: True if the batch is full and flush_predictions should
+                  be called
+        """
+        self._pending_feats.append(np.asarray(features, dtype=np.float32))
+        return len(self._pending_feats) >= self.max_batch_size
+
+    def flush_predictions(self, confidence_threshold=0.3):
+        """Classify all queued feature vectors in one call and clear the
+        queue. Returns a list of (prediction, confidence) tuples."""
+        if not self._pending_feats:
+            return []
+        results = self.predict_batch(self._pending_feats, confidence_threshold)
+        self._pending_feats = []
+        return results
+
+    def _fill_lm_buf(self, landmark_list):
+        """
+        Copy a list of landmark rows into the preallocated (21, 2) buffer.
+
+        Accepts legacy [id, x, y] rows as well as plain [x, y] pairs;
+        only x and y are kept. Returns the shared buffer, so callers must
+        not hold it across frames.
+        """
+        offset = 1 if len(landmark_list[0]) > 2 else 0
+        buf = self._lm_buf
+        for i, row in enumerate(landmark_list[:21]):
+            buf[i, 0] = row[offset]
+            buf[i, 1] = row[offset + 1]
+        return buf
+
+    @staticmethod
+    def _pose_key(landmarks):
+        """
+        Hash a landmark array into a compact pose key.
+
+        Pixel coordinates are quantized to 2-px bins so sub-pixel jitter
+        while a sign is held maps to the same key; the 8-byte blake2b
+        digest of the quantized buffer is cheap to compute and to store.
+        Returns None for input the cache cannot key (non-array-like).
+        """
+        try:
+            arr = np.asarray(landmarks, dtype=np.float32)
+            quantized = np.round(arr * 0.5).astype(np.int16)
+            return hashlib.blake2b(quantized.tobytes(), digest_size=8).digest()
+        except (TypeError, ValueError):
+            return None
+
+    def recognize_sign(self, features, confidence_threshold=0.3, landmarks=None,
+                       detection_score=None):
         """
         Recognize sign and return text.
-        
+
         Args:
             features: Feature vector from hand detector (optional if using gesture recognition)
             confidence_threshold: Minimum confidence for recognition
             landmarks: List of hand landmarks in format [id, x, y] (required for gesture recognition)
-            
+            detection_score: MediaPipe hand-detection confidence; frames
+                             scoring far below the rolling average are
+                             skipped without running recognition
+
         Returns:
             text: Recognized sign text or None
             confidence: Recognition confidence
         """
+        if detection_score is not None:
+            ema = self._ema_conf
+            self._ema_conf = 0.9 * ema + 0.1 * detection_score if ema else detection_score
+            if detection_score < ema * 0.6:
+                # Noisy or occluded frame; landmarks are not trustworthy
+                return None, 0.0
         # Use gesture-based recognition if enabled and landmarks are provided
         if self.use_gesture_recognition and landmarks is not None and len(landmarks) >= 21:
+            if not isinstance(landmarks, np.ndarray):
+                landmarks = self._fill_lm_buf(landmarks)
+
+            # Quantized-pose cache: during a sign hold the pose hashes to
+            # the same key, so the geometry rules run only on pose change
+            key = self._pose_key(landmarks)
+            if key is not None:
+                cached = self._gesture_cache.get(key)
+                if cached is not None:
+                    self._gesture_cache.move_to_end(key)
+                    return cached
+
             sign_id, sign_name, confidence = self.gesture_recognizer.recognize_from_landmarks(landmarks)
-            
+
+            result = (None, confidence if confidence else 0.0)
             if sign_id is not None and confidence >= confidence_threshold:
                 # Check if sign is in dictionary, otherwise use recognized name
-                if str(sign_id) in self.sign_dict:
-                    return self.sign_dict[str(sign_id)], confidence
+                text = self._sign_dict_int.get(sign_id)
+                if text is not None:
+                    result = (text, confidence)
                 elif sign_name:
-                    return sign_name, confidence
-            
-            return None, confidence if confidence else 0.0
+                    result = (sign_name, confidence)
+
+            if key is not None:
+                self._gesture_cache[key] = result
+                if len(self._gesture_cache) > self._gesture_cache_size:
+                    self._gesture_cache.popitem(last=False)
+
+            return result
         
         # Fall back to ML model if gesture recognition is disabled or landmarks not available
-        if self.model is not None and features is not None:
+        if (self.model is not None or self._onnx_session is not None) and features is not None:
             sign_id, confidence = self.predict(features, confidence_threshold)
-            
-            if sign_id is not None and str(sign_id) in self.sign_dict:
-                return self.sign_dict[str(sign_id)], confidence
+
+            if sign_id is not None:
+                text = self._sign_dict_int.get(sign_id)
+                if text is not None:
+                    return text, confidence
         
         return None, 0.0
 
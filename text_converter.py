@@ -18,15 +18,32 @@ class TextConverter:
         self.sign_dict = self.load_sign_dictionary(sign_dict_path)
         self.current_sentence = []
         self.history = []
+
+        # Cached joined sentence and its last token, maintained
+        # incrementally on mutation so get_current_sentence (called every
+        # frame) never re-joins the word list
+        self._sentence_str = ""
+        self._last_token = None
     
     def load_sign_dictionary(self, dict_path):
         """Load sign dictionary from JSON file."""
         try:
             with open(dict_path, 'r') as f:
-                return json.load(f)
+                sign_dict = json.load(f)
         except FileNotFoundError:
             print(f"Warning: Sign dictionary not found at {dict_path}")
-            return {}
+            sign_dict = {}
+
+        # Parallel int-keyed view so convert_sign_to_text hashes the sign
+        # id directly instead of allocating a str(sign_id) per call
+        self._sign_dict_int = {}
+        for key, value in sign_dict.items():
+            try:
+                self._sign_dict_int[int(key)] = value
+            except (TypeError, ValueError):
+                pass
+
+        return sign_dict
     
     def add_sign(self, sign_text, min_confidence=0.5, confidence=1.0):
         """
@@ -42,29 +59,36 @@ class TextConverter:
         """
         if sign_text and confidence >= min_confidence:
             # Avoid adding duplicate consecutive signs
-            if not self.current_sentence or self.current_sentence[-1] != sign_text:
+            if self._last_token != sign_text:
                 self.current_sentence.append(sign_text)
+                self._sentence_str += (" " if self._sentence_str else "") + sign_text
+                self._last_token = sign_text
                 return True
         return False
-    
+
     def get_current_sentence(self):
         """Get the current sentence as a string."""
-        return " ".join(self.current_sentence)
-    
+        return self._sentence_str
+
     def clear_sentence(self):
         """Clear the current sentence."""
         if self.current_sentence:
-            self.history.append(" ".join(self.current_sentence))
+            self.history.append(self._sentence_str)
         self.current_sentence = []
-    
+        self._sentence_str = ""
+        self._last_token = None
+
     def get_history(self):
         """Get the history of all sentences."""
         return self.history
-    
+
     def remove_last_word(self):
         """Remove the last word from the current sentence."""
         if self.current_sentence:
             self.current_sentence.pop()
+            # Backspace is rare, so a full re-join here is fine
+            self._sentence_str = " ".join(self.current_sentence)
+            self._last_token = self.current_sentence[-1] if self.current_sentence else None
     
     def convert_sign_to_text(self, sign_id):
         """
@@ -76,10 +100,10 @@ class TextConverter:
         Returns:
             text: The corresponding text or None
         """
-        sign_key = str(sign_id)
-        if sign_key in self.sign_dict:
-            return self.sign_dict[sign_key]
-        return None
+        try:
+            return self._sign_dict_int.get(int(sign_id))
+        except (TypeError, ValueError):
+            return None
     
     def format_output(self, current_sign=None, confidence=0.0):
         """
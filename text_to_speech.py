@@ -4,29 +4,41 @@ Provides text-to-speech functionality for sign language detection.
 """
 
 import threading
-import queue
 import time
+from collections import deque
 
 
 class TextToSpeech:
     """Text-to-speech engine for speaking detected signs."""
     
-    def __init__(self, enabled=True, rate=150, volume=0.8, voice_id=None):
+    def __init__(self, enabled=True, rate=150, volume=0.8, voice_id=None,
+                 max_batch_size=4, batch_timeout=0.15):
         """
         Initialize the Text-to-Speech engine.
-        
+
         Args:
             enabled: Whether TTS is enabled
             rate: Speech rate (words per minute, default 150)
             volume: Speech volume (0.0 to 1.0, default 0.8)
             voice_id: Voice ID to use (None for default)
+            max_batch_size: Maximum queued texts merged into one utterance
+            batch_timeout: Seconds to wait for follow-up texts to merge
         """
         self.enabled = enabled
         self.rate = rate
         self.volume = volume
         self.voice_id = voice_id
+        self.max_batch_size = max_batch_size
+        self.batch_timeout = batch_timeout
         self.engine = None
-        self.speech_queue = queue.Queue()
+        # Pending texts live in a bounded ring deque paired with an Event.
+        # With one producer and one consumer, deque append/popleft/clear
+        # are atomic under the GIL, so steady-state puts take no lock at
+        # all; the Event only signals the worker to wake. If the ring
+        # overflows, the oldest texts are dropped - better stale speech
+        # lost than an ever-growing backlog trailing the video.
+        self._pending = deque(maxlen=16)
+        self._wake = threading.Event()
         self.speaking = False
         self.worker_thread = None
         self.stop_flag = False
@@ -76,29 +88,44 @@ class TextToSpeech:
         self.worker_thread.start()
     
     def _speech_worker(self):
-        """Worker thread that processes speech queue."""
+        """Worker thread that processes pending speech texts."""
         while not self.stop_flag:
-            try:
-                # Get text from queue with timeout
-                text = self.speech_queue.get(timeout=0.5)
-                if text is None:  # Shutdown signal
+            # The wake timeout also covers the benign race where a text
+            # is appended between the pop below and the clear here
+            if not self._wake.wait(timeout=0.5):
+                continue
+            self._wake.clear()
+
+            while self._pending and not self.stop_flag:
+                # stop() and speak(interrupt=True) clear the ring from the
+                # UI thread, so a check-then-pop can still find it empty
+                try:
+                    batch = [self._pending.popleft()]
+                except IndexError:
                     break
-                
+
+                # Merge closely following texts into one utterance:
+                # runAndWait has a fixed startup cost per call, so speaking
+                # "Hello Good" once beats two separate engine round-trips
+                while len(batch) < self.max_batch_size:
+                    if self._pending:
+                        try:
+                            batch.append(self._pending.popleft())
+                        except IndexError:
+                            break
+                    elif self._wake.wait(timeout=self.batch_timeout):
+                        self._wake.clear()
+                    else:
+                        break
+
                 self.speaking = True
                 try:
-                    self.engine.say(text)
+                    self.engine.say(" ".join(batch))
                     self.engine.runAndWait()
                 except Exception as e:
                     print(f"Error during speech: {e}")
                 finally:
                     self.speaking = False
-                    self.speech_queue.task_done()
-                    
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"Error in speech worker: {e}")
-                self.speaking = False
     
     def speak(self, text, interrupt=False):
         """
@@ -112,18 +139,10 @@ class TextToSpeech:
             return
         
         if interrupt:
-            # Clear queue and add new text
-            while not self.speech_queue.empty():
-                try:
-                    self.speech_queue.get_nowait()
-                except queue.Empty:
-                    break
-        
-        # Add text to queue
-        try:
-            self.speech_queue.put_nowait(text)
-        except queue.Full:
-            print("Speech queue is full, skipping...")
+            # deque.clear is atomic under the GIL; no lock needed
+            self._pending.clear()
+        self._pending.append(text)
+        self._wake.set()
     
     def speak_async(self, text):
         """Speak text asynchronously (non-blocking)."""
@@ -136,17 +155,13 @@ class TextToSpeech:
         
         try:
             self.engine.stop()
-            while not self.speech_queue.empty():
-                try:
-                    self.speech_queue.get_nowait()
-                except queue.Empty:
-                    break
+            self._pending.clear()
         except Exception as e:
             print(f"Error stopping speech: {e}")
-    
+
     def is_speaking(self):
         """Check if currently speaking."""
-        return self.speaking or not self.speech_queue.empty()
+        return self.speaking or bool(self._pending)
     
     def set_rate(self, rate):
         """Set speech rate (words per minute)."""
@@ -190,11 +205,8 @@ class TextToSpeech:
         self.stop_flag = True
         self.stop()
         if self.worker_thread and self.worker_thread.is_alive():
-            # Send shutdown signal
-            try:
-                self.speech_queue.put_nowait(None)
-            except:
-                pass
+            # Wake the worker so it sees the stop flag
+            self._wake.set()
             self.worker_thread.join(timeout=1.0)
         
         if self.engine:
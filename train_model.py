@@ -10,8 +10,13 @@ import pickle
 import json
 import time
 from detector import HandDetector
+from frame_grabber import FrameGrabber
+from overlay import blit_overlay, render_text_overlay
 from recognizer import SignRecognizer
 
+# 21 landmarks x 2 wrist-normalized coordinates per sample
+FEATURE_DIM = 42
+
 
 def collect_training_data(sign_id, num_samples=50, output_dir="data"):
     """
@@ -23,7 +28,7 @@ def collect_training_data(sign_id, num_samples=50, output_dir="data"):
         output_dir: Directory to save training data
     """
     os.makedirs(output_dir, exist_ok=True)
-    
+
     detector = HandDetector(
         mode=False,
         max_hands=1,
@@ -33,37 +38,54 @@ def collect_training_data(sign_id, num_samples=50, output_dir="data"):
     
     cap = cv2.VideoCapture(0)
     samples_collected = 0
-    features_list = []
-    
+    # Preallocate the whole feature matrix and write rows in place, so
+    # capturing never grows a Python list of arrays
+    features_buf = np.empty((num_samples, FEATURE_DIM), dtype=np.float32)
+
+    # Read frames on a background thread so camera I/O overlaps detection
+    grabber = FrameGrabber(cap)
+    grabber.start()
+
     print(f"Collecting data for sign ID: {sign_id}")
     print(f"Press 's' to capture sample, 'q' to quit")
     print(f"Target: {num_samples} samples")
-    
+
+    # Pre-render the static instruction lines once; the counter line is
+    # re-rendered only when the sample count changes
+    instructions_overlay = render_text_overlay(
+        ["Press 's' to capture, 'q' to quit"], 450, color=(255, 255, 255)
+    )
+    hand_overlay = render_text_overlay(
+        ["Hand detected - Press 's' to capture"], 500, color=(0, 255, 255)
+    )
+    counter_overlay = None
+    counter_value = None
+
     while samples_collected < num_samples:
-        success, img = cap.read()
-        if not success:
-            break
-        
-        img = cv2.flip(img, 1)
-        img, results = detector.find_hands(img, draw=True)
-        
-        features = detector.extract_features(img, hand_no=0)
-        
+        img = grabber.read()
+        if img is None:
+            if grabber.stop_event.is_set():
+                break
+            continue
+
+        # flip=True mirrors into the detector's reused buffer instead of
+        # allocating a flipped copy per frame
+        result = detector.process_frame(img, draw=True, flip=True)
+        img = result.img
+        features = result.features
+
         # Display instructions
-        cv2.putText(
-            img, f"Sign ID: {sign_id} | Samples: {samples_collected}/{num_samples}",
-            (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2
-        )
-        cv2.putText(
-            img, "Press 's' to capture, 'q' to quit",
-            (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2
-        )
-        
-        if features is not None:
-            cv2.putText(
-                img, "Hand detected - Press 's' to capture",
-                (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2
+        if counter_value != samples_collected:
+            counter_value = samples_collected
+            counter_overlay = render_text_overlay(
+                [f"Sign ID: {sign_id} | Samples: {samples_collected}/{num_samples}"],
+                620, line_height=40, font_scale=1, color=(0, 255, 0)
             )
+        blit_overlay(img, counter_overlay[0], counter_overlay[1], 10, 0)
+        blit_overlay(img, instructions_overlay[0], instructions_overlay[1], 10, 48)
+
+        if features is not None:
+            blit_overlay(img, hand_overlay[0], hand_overlay[1], 10, 88)
         
         cv2.imshow("Training Data Collection", img)
         
@@ -71,52 +93,104 @@ def collect_training_data(sign_id, num_samples=50, output_dir="data"):
         if key == ord('q'):
             break
         elif key == ord('s') and features is not None:
-            features_list.append(features)
+            # Row assignment copies out of the detector's reused view
+            features_buf[samples_collected] = features
             samples_collected += 1
             print(f"Sample {samples_collected}/{num_samples} collected")
             time.sleep(0.5)  # Small delay between captures
-    
+
+    grabber.stop()
+    grabber.join(timeout=1.0)
     cap.release()
     cv2.destroyAllWindows()
     
     # Save collected data
-    if features_list:
+    if samples_collected:
         data_file = os.path.join(output_dir, f"sign_{sign_id}.npz")
-        np.savez(data_file, features=np.array(features_list), label=sign_id)
+        # Features are wrist-normalized into roughly [-1, 1], so int8 with
+        # a fixed 1/127 scale preserves them to ~0.8% while shrinking the
+        # shard (and later training-time bandwidth) 4x vs float32
+        features = features_buf[:samples_collected]
+        quantized = np.clip(np.round(features * 127), -128, 127).astype(np.int8)
+        np.savez(data_file, features=quantized, scale=np.float32(1 / 127), label=sign_id)
         print(f"Data saved to {data_file}")
-        return len(features_list)
+        # Refresh the consolidated arrays so the next training run can
+        # memory-map one contiguous file instead of re-reading every shard
+        consolidate_training_data(output_dir)
+        return samples_collected
     else:
         print("No data collected")
         return 0
 
 
-def load_training_data(data_dir="data"):
+def consolidate_training_data(data_dir="data"):
+    """
+    Merge all per-sign .npz shards into contiguous features.npy/labels.npy.
+
+    The consolidated files are written uncompressed, so later training
+    runs can memory-map them instead of re-opening and zlib-decompressing
+    every shard; the kernel page cache then makes repeat runs nearly free.
+
+    Args:
+        data_dir: Directory containing training data files
+
+    Returns:
+        int: Number of consolidated samples
+    """
+    features, labels = load_training_data(data_dir, use_consolidated=False)
+    if len(features) == 0:
+        return 0
+
+    np.save(os.path.join(data_dir, "features.npy"), np.ascontiguousarray(features))
+    np.save(os.path.join(data_dir, "labels.npy"), np.ascontiguousarray(labels))
+    print(f"Consolidated {len(features)} samples into {data_dir}/features.npy")
+    return len(features)
+
+
+def load_training_data(data_dir="data", use_consolidated=True):
     """
     Load all training data from directory.
-    
+
     Args:
         data_dir: Directory containing training data files
-        
+        use_consolidated: Prefer memory-mapped features.npy/labels.npy
+                          written by consolidate_training_data when present
+
     Returns:
         features: Array of feature vectors
         labels: Array of labels
     """
-    features_list = []
-    labels_list = []
-    
+    feature_arrays = []
+    label_arrays = []
+
     if not os.path.exists(data_dir):
         print(f"Data directory {data_dir} does not exist")
         return np.array([]), np.array([])
-    
-    for filename in os.listdir(data_dir):
-        if filename.startswith("sign_") and filename.endswith(".npz"):
-            filepath = os.path.join(data_dir, filename)
-            data = np.load(filepath)
-            features_list.extend(data['features'])
-            labels_list.extend([data['label']] * len(data['features']))
-    
-    if features_list:
-        return np.array(features_list), np.array(labels_list)
+
+    features_path = os.path.join(data_dir, "features.npy")
+    labels_path = os.path.join(data_dir, "labels.npy")
+    if use_consolidated and os.path.exists(features_path) and os.path.exists(labels_path):
+        # Memory-mapped views: pages are faulted in on demand and shared
+        # with the page cache, so nothing is decompressed or copied here
+        return (np.load(features_path, mmap_mode='r'),
+                np.load(labels_path, mmap_mode='r'))
+
+    # Collect whole per-file arrays and concatenate once at the end:
+    # extending Python lists row by row costs an object per sample plus a
+    # final full copy, while np.concatenate is a single C-level merge
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith("sign_") and entry.name.endswith(".npz"):
+                data = np.load(entry.path)
+                features = data['features']
+                if 'scale' in data.files:
+                    # Quantized shard: dequantize once to float32
+                    features = features.astype(np.float32) * data['scale']
+                feature_arrays.append(features)
+                label_arrays.append(np.full(len(features), data['label'], dtype=np.int32))
+
+    if feature_arrays:
+        return np.concatenate(feature_arrays, axis=0), np.concatenate(label_arrays)
     else:
         return np.array([]), np.array([])
 